@@ -88,6 +88,24 @@ class FactorArguments(Arguments):
         default=torch.float32,
         metadata={"help": "Data type for pseudo-gradient covariance computation."},
     )
+    activation_covariance_input_dtype: Optional[torch.dtype] = field(
+        default=None,
+        metadata={
+            "help": "Data type for the flattened activations used in the covariance matrix multiplication. "
+            "The covariance matrix is still accumulated in `activation_covariance_dtype`, but each batch's "
+            "covariance is computed in this data type before being added. "
+            "If `None`, uses `activation_covariance_dtype`."
+        },
+    )
+    gradient_covariance_input_dtype: Optional[torch.dtype] = field(
+        default=None,
+        metadata={
+            "help": "Data type for the flattened pseudo-gradients used in the covariance matrix multiplication. "
+            "The covariance matrix is still accumulated in `gradient_covariance_dtype`, but each batch's covariance is "
+            "computed in this data type before being added. "
+            "If `None`, uses `gradient_covariance_dtype`."
+        },
+    )
 
     # Configuration for performing eigendecomposition #
     eigendecomposition_dtype: torch.dtype = field(
@@ -117,7 +135,7 @@ class FactorArguments(Arguments):
         default=False,
         metadata={
             "help": "If `True`, aggregates the squared sum of projected per-sample gradients "
-            "iteratively (with for-loop) to reduce GPU memory usage."
+            "iteratively (in chunks of examples) to reduce GPU memory usage."
         },
     )
     offload_activations_to_cpu: bool = field(
@@ -130,7 +148,10 @@ class FactorArguments(Arguments):
     )
     lambda_dtype: torch.dtype = field(
         default=torch.float32,
-        metadata={"help": "Data type for Lambda matrix computation."},
+        metadata={
+            "help": "Data type for saving Lambda matrices. The Lambda matrices are accumulated in at least "
+            "`torch.float32` and cast to this data type after all iterations."
+        },
     )
 
     def __post_init__(self) -> None:
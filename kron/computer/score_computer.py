@@ -1,3 +1,4 @@
+import math
 import os
 import time
 from pathlib import Path
@@ -221,7 +222,7 @@ class ScoreComputer(Computer):
         factors_name: str,
         query_dataset: data.Dataset,
         train_dataset: data.Dataset,
-        per_device_query_batch_size: int,
+        per_device_query_batch_size: Optional[int],
         per_device_train_batch_size: Optional[int] = None,
         initial_per_device_train_batch_size_attempt: int = 4096,
         query_indices: Optional[Sequence[int]] = None,
@@ -243,8 +244,9 @@ class ScoreComputer(Computer):
                 The query dataset, typically much smaller than the training dataset.
             train_dataset (data.Dataset):
                 The training dataset.
-            per_device_query_batch_size (int):
-                The per-device batch size used to compute query gradients.
+            per_device_query_batch_size (int, optional):
+                The per-device batch size used to compute query gradients. If `None`, all query data points
+                are processed in a single batch, which avoids scoring the training dataset multiple times.
             per_device_train_batch_size (int, optional):
                 The per-device batch size used to compute training gradients. If not specified, an executable
                 batch size will be found.
@@ -332,6 +334,10 @@ class ScoreComputer(Computer):
             train_dataset = data.Subset(dataset=train_dataset, indices=train_indices)
             del train_indices
 
+        if per_device_query_batch_size is None:
+            per_device_query_batch_size = math.ceil(len(query_dataset) / self.state.num_processes)
+            self.logger.info(f"Using per-device query batch size of {per_device_query_batch_size}.")
+
         with self.profiler.profile("Load All Factors"):
             loaded_factors = self.load_all_factors(
                 factors_name=factors_name,
@@ -14,6 +14,7 @@ from tqdm import tqdm
 from kron.arguments import FactorArguments
 from kron.module.tracked_module import ModuleMode
 from kron.module.utils import (
+    finalize_all_iterations,
     finalize_iteration,
     get_tracked_module_names,
     load_factors,
@@ -449,6 +450,7 @@ def fit_lambda_matrices_with_loader(
         num_data_processed = num_data_processed.to(device=state.device)
         dist.all_reduce(tensor=num_data_processed, op=torch.distributed.ReduceOp.SUM)
         num_data_processed = num_data_processed.cpu()
+    finalize_all_iterations(model=model, tracked_module_names=tracked_module_names)
 
     saved_factors: FACTOR_TYPE = {}
     if state.is_main_process:
@@ -1,4 +1,4 @@
-from typing import Optional, Tuple, Union
+from typing import Iterator, Optional, Tuple, Union
 
 import torch
 import torch.nn.functional as F
@@ -9,6 +9,7 @@ from torch import _VF, nn
 from torch.nn.modules.utils import _pair
 
 from kron.module.tracked_module import TrackedModule
+from kron.utils.constants import FLATTENED_ACTIVATION_CHUNK_NUMEL
 from kron.utils.exceptions import UnsupportableModuleError
 
 
@@ -127,6 +128,17 @@ class TrackedConv2d(TrackedModule, module_type=nn.Conv2d):
         count = input_activation.size(0)
         return input_activation, count
 
+    def get_flattened_activation_chunks(
+        self, input_activation: torch.Tensor
+    ) -> Iterator[Tuple[torch.Tensor, Union[torch.Tensor, int]]]:
+        # The extracted patches contain roughly `K1 * K2 / (S1 * S2 * groups)` times as many elements as the input.
+        kernel_size, stride = _pair(self.original_module.kernel_size), _pair(self.original_module.stride)
+        expansion = (kernel_size[0] * kernel_size[1]) / (stride[0] * stride[1] * self.original_module.groups)
+        numel_per_example = max(input_activation[0].numel() * expansion, 1)
+        chunk_size = max(int(FLATTENED_ACTIVATION_CHUNK_NUMEL // numel_per_example), 1)
+        for input_activation_chunk in input_activation.split(chunk_size):
+            yield self.get_flattened_activation(input_activation=input_activation_chunk)
+
     def get_flattened_gradient(self, output_gradient: torch.Tensor) -> Tuple[torch.Tensor, Union[torch.Tensor, int]]:
         output_gradient = rearrange(output_gradient, "b c o1 o2 -> (b o1 o2) c")
         return output_gradient, output_gradient.size(0)
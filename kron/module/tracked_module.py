@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import torch
 from accelerate.utils.dataclasses import BaseEnum
@@ -300,6 +300,10 @@ class TrackedModule(nn.Module):
         """
         self._trackers[self.current_mode].synchronize(num_processes=num_processes)
 
+    def wait_for_synchronization(self) -> None:
+        """Waits for all asynchronous operations issued by `synchronize` to complete."""
+        self._trackers[self.current_mode].wait_for_synchronization()
+
     def truncate(self, keep_size: int) -> None:
         """Truncates stored statistics to a specified size.
 
@@ -332,6 +336,22 @@ class TrackedModule(nn.Module):
         """
         raise NotImplementedError("Subclasses must implement the `get_flattened_activation` method.")
 
+    def get_flattened_activation_chunks(
+        self, input_activation: torch.Tensor
+    ) -> Iterator[Tuple[torch.Tensor, Union[torch.Tensor, int]]]:
+        """Yields the flattened activation tensors and the number of stacked activations for chunks of the input.
+        By default, the whole input is flattened at once.
+
+        Args:
+            input_activation (torch.Tensor):
+                The input tensor to the module, provided by the PyTorch's forward hook.
+
+        Returns:
+            Iterator[Tuple[torch.Tensor, Union[torch.Tensor, int]]]:
+                The flattened activation tensor and the number of stacked activations for each chunk.
+        """
+        yield self.get_flattened_activation(input_activation=input_activation)
+
     @abstractmethod
     def get_flattened_gradient(self, output_gradient: torch.Tensor) -> Tuple[torch.Tensor, Union[torch.Tensor, int]]:
         """Returns the flattened output gradient tensor.
@@ -1,6 +1,7 @@
-from typing import List, Optional, Union
+from typing import Deque, List, Optional, Union
 
 import torch
+import torch.distributed as dist
 from torch import nn
 from torch.utils.hooks import RemovableHandle
 
@@ -18,8 +19,9 @@ class BaseTracker:
         self.module = module
         self.registered_hooks: List[RemovableHandle] = []
         self.cached_hooks: List[RemovableHandle] = []
-        self.cached_activations: Optional[Union[List[torch.Tensor]], torch.Tensor] = None
+        self.cached_activations: Optional[Union[List[torch.Tensor], Deque[torch.Tensor], torch.Tensor]] = None
         self.cached_per_sample_gradient: Optional[torch.Tensor] = None
+        self.pending_reductions: List[dist.Work] = []
 
     def release_hooks(self) -> None:
         """Removes all registered hooks."""
@@ -38,6 +40,27 @@ class BaseTracker:
             handle.remove()
         self.cached_hooks = []
 
+    @staticmethod
+    def _offload_activation_to_cpu(activation: torch.Tensor, dtype: torch.dtype) -> torch.Tensor:
+        """Copies the activation to CPU memory. CUDA activations are copied asynchronously into pinned memory,
+        so that the copy overlaps with the rest of the forward pass.
+
+        Args:
+            activation (torch.Tensor):
+                The activation tensor to offload.
+            dtype (torch.dtype):
+                The desired dtype for the offloaded activation.
+
+        Returns:
+            torch.Tensor:
+                The activation tensor in CPU memory.
+        """
+        if not activation.is_cuda:
+            return activation.to(device="cpu", dtype=dtype, copy=True)
+        cpu_activation = torch.empty(activation.size(), dtype=dtype, pin_memory=True)
+        cpu_activation.copy_(activation, non_blocking=True)
+        return cpu_activation
+
     def _raise_cache_not_found_exception(self) -> None:
         """Raises an exception when cached activations are not found."""
         raise RuntimeError(
@@ -47,6 +70,29 @@ class BaseTracker:
             f"For case 2, set 'has_shared_parameters=True' to enable parameter sharing."
         )
 
+    def _reduce_factors(self, factor_names: List[str]) -> None:
+        """Issues asynchronous reductions that sum the given factors across all processes into the main process.
+        The reductions are completed in `wait_for_synchronization`, so that reductions for different modules
+        can be in flight at the same time.
+
+        Args:
+            factor_names (List[str]):
+                The names of the factors in the module's storage to be reduced.
+        """
+        device = torch.device("cuda", torch.cuda.current_device())
+        for factor_name in factor_names:
+            if self.module.storage[factor_name].device != device:
+                # Only copies factors (e.g., the number of processed examples) that are not already on the device.
+                self.module.storage[factor_name] = self.module.storage[factor_name].to(device=device)
+            self.pending_reductions.append(
+                dist.reduce(
+                    tensor=self.module.storage[factor_name],
+                    op=dist.ReduceOp.SUM,
+                    dst=0,
+                    async_op=True,
+                )
+            )
+
     def register_hooks(self) -> None:
         """Registers hooks for the module."""
 
@@ -70,6 +116,12 @@ class BaseTracker:
                 The number of processes to synchronize across.
         """
 
+    def wait_for_synchronization(self) -> None:
+        """Waits for all asynchronous reductions issued by `synchronize` to complete."""
+        while self.pending_reductions:
+            handle = self.pending_reductions.pop()
+            handle.wait()
+
     def truncate(self, keep_size: int) -> None:
         """Truncates stored statistics to a specified size.
 
@@ -1,4 +1,5 @@
-from typing import Tuple, Union
+from collections import deque
+from typing import Deque, Tuple, Union
 
 import torch
 import torch.distributed as dist
@@ -9,10 +10,13 @@ from kron.module.tracker.base import BaseTracker
 from kron.utils.constants import (
     ACTIVATION_COVARIANCE_MATRIX_NAME,
     ACTIVATION_EIGENVECTORS_NAME,
+    COVARIANCE_ACCUMULATION_BLOCK_SIZE,
     COVARIANCE_FACTOR_NAMES,
+    COVARIANCE_UNFUSED_ACCUMULATION_THRESHOLD,
     EIGENDECOMPOSITION_FACTOR_NAMES,
     GRADIENT_COVARIANCE_MATRIX_NAME,
     GRADIENT_EIGENVECTORS_NAME,
+    LAMBDA_AGGREGATION_CHUNK_SIZE,
     LAMBDA_FACTOR_NAMES,
     LAMBDA_MATRIX_NAME,
     NUM_ACTIVATION_COVARIANCE_PROCESSED,
@@ -28,6 +32,29 @@ class CovarianceTracker(BaseTracker):
     _activation_covariance_initialized: bool = False
     _gradient_covariance_initialized: bool = False
 
+    def _accumulate_symmetric_gram(self, factor_name: str, flattened: torch.Tensor, alpha: float = 1.0) -> None:
+        """Adds `alpha * flattened.T @ flattened` to the stored covariance matrix one block of rows at a time.
+        Since the Gram matrix is symmetric, only the blocks on and above the diagonal are computed and the blocks
+        below the diagonal are mirrored, which roughly halves the FLOPs and bounds the size of the temporary
+        product by `COVARIANCE_ACCUMULATION_BLOCK_SIZE` rows.
+
+        Args:
+            factor_name (str):
+                The name of the covariance matrix in the module's storage.
+            flattened (torch.Tensor):
+                The flattened activation or gradient tensor.
+            alpha (float):
+                The scale applied to the Gram matrix before accumulation.
+        """
+        covariance_matrix = self.module.storage[factor_name]
+        dimension = flattened.size(1)
+        for start in range(0, dimension, COVARIANCE_ACCUMULATION_BLOCK_SIZE):
+            end = min(start + COVARIANCE_ACCUMULATION_BLOCK_SIZE, dimension)
+            block = torch.mm(flattened[:, start:end].t(), flattened[:, start:])
+            covariance_matrix[start:end, start:].add_(block, alpha=alpha)
+            if end < dimension:
+                covariance_matrix[end:, start:end].add_(block[:, end - start :].t(), alpha=alpha)
+
     def _update_activation_covariance_matrix(
         self, input_activation: torch.Tensor, count: Union[torch.Tensor, int]
     ) -> None:
@@ -49,13 +76,24 @@ class CovarianceTracker(BaseTracker):
             dimension = input_activation.size(1)
             self.module.storage[ACTIVATION_COVARIANCE_MATRIX_NAME] = torch.zeros(
                 size=(dimension, dimension),
-                dtype=input_activation.dtype,
+                dtype=self.module.factor_args.activation_covariance_dtype,
                 device=input_activation.device,
                 requires_grad=False,
             )
             self._activation_covariance_initialized = True
         self.module.storage[NUM_ACTIVATION_COVARIANCE_PROCESSED].add_(count)
-        self.module.storage[ACTIVATION_COVARIANCE_MATRIX_NAME].addmm_(input_activation.t(), input_activation)
+        if input_activation.size(1) >= COVARIANCE_UNFUSED_ACCUMULATION_THRESHOLD:
+            # For large dimensions, separate matrix multiplications and additions are faster than the fused `addmm_`.
+            self._accumulate_symmetric_gram(
+                factor_name=ACTIVATION_COVARIANCE_MATRIX_NAME,
+                flattened=input_activation,
+            )
+        elif input_activation.dtype != self.module.storage[ACTIVATION_COVARIANCE_MATRIX_NAME].dtype:
+            # The fused `addmm_` requires all operands to have the same dtype.
+            covariance = torch.mm(input_activation.t(), input_activation)
+            self.module.storage[ACTIVATION_COVARIANCE_MATRIX_NAME].add_(covariance)
+        else:
+            self.module.storage[ACTIVATION_COVARIANCE_MATRIX_NAME].addmm_(input_activation.t(), input_activation)
 
     def _update_gradient_covariance_matrix(
         self, output_gradient: torch.Tensor, count: Union[torch.Tensor, int]
@@ -81,7 +119,7 @@ class CovarianceTracker(BaseTracker):
             dimension = output_gradient.size(1)
             self.module.storage[GRADIENT_COVARIANCE_MATRIX_NAME] = torch.zeros(
                 size=(dimension, dimension),
-                dtype=output_gradient.dtype,
+                dtype=self.module.factor_args.gradient_covariance_dtype,
                 device=output_gradient.device,
                 requires_grad=False,
             )
@@ -90,7 +128,19 @@ class CovarianceTracker(BaseTracker):
         alpha = 1
         if self.module.gradient_scale != 1.0:
             alpha = self.module.gradient_scale**2.0
-        self.module.storage[GRADIENT_COVARIANCE_MATRIX_NAME].addmm_(output_gradient.t(), output_gradient, alpha=alpha)
+        if output_gradient.size(1) >= COVARIANCE_UNFUSED_ACCUMULATION_THRESHOLD:
+            self._accumulate_symmetric_gram(
+                factor_name=GRADIENT_COVARIANCE_MATRIX_NAME,
+                flattened=output_gradient,
+                alpha=alpha,
+            )
+        elif output_gradient.dtype != self.module.storage[GRADIENT_COVARIANCE_MATRIX_NAME].dtype:
+            covariance = torch.mm(output_gradient.t(), output_gradient)
+            self.module.storage[GRADIENT_COVARIANCE_MATRIX_NAME].add_(covariance, alpha=alpha)
+        else:
+            self.module.storage[GRADIENT_COVARIANCE_MATRIX_NAME].addmm_(
+                output_gradient.t(), output_gradient, alpha=alpha
+            )
 
     def register_hooks(self) -> None:
         """Sets up hooks to compute activation and gradient covariance matrices."""
@@ -98,24 +148,32 @@ class CovarianceTracker(BaseTracker):
         @torch.no_grad()
         def forward_hook(module: nn.Module, inputs: Tuple[torch.Tensor], outputs: torch.Tensor) -> None:
             del module
+            input_dtype = self.module.factor_args.activation_covariance_input_dtype
+            if input_dtype is None:
+                input_dtype = self.module.factor_args.activation_covariance_dtype
             input_activation = (
                 inputs[0]
                 .detach()
                 .to(
-                    dtype=self.module.factor_args.activation_covariance_dtype,
+                    dtype=input_dtype,
                     copy=self.module.attention_mask is not None,
                 )
             )
             # Computes and updates activation covariance during forward pass.
-            input_activation, count = self.module.get_flattened_activation(input_activation=input_activation)
-            self._update_activation_covariance_matrix(input_activation=input_activation, count=count)
+            for flattened_activation, count in self.module.get_flattened_activation_chunks(
+                input_activation=input_activation
+            ):
+                self._update_activation_covariance_matrix(input_activation=flattened_activation, count=count)
             self.cached_hooks.append(outputs.register_hook(backward_hook))
 
         @torch.no_grad()
         def backward_hook(output_gradient: torch.Tensor) -> None:
             handle = self.cached_hooks.pop()
             handle.remove()
-            output_gradient = output_gradient.detach().to(dtype=self.module.factor_args.gradient_covariance_dtype)
+            input_dtype = self.module.factor_args.gradient_covariance_input_dtype
+            if input_dtype is None:
+                input_dtype = self.module.factor_args.gradient_covariance_dtype
+            output_gradient = output_gradient.detach().to(dtype=input_dtype)
             # Computes and updates pseudo-gradient covariance during backward pass.
             output_gradient, count = self.module.get_flattened_gradient(output_gradient=output_gradient)
             self._update_gradient_covariance_matrix(output_gradient=output_gradient, count=count)
@@ -133,13 +191,7 @@ class CovarianceTracker(BaseTracker):
         """Aggregates covariance matrices across multiple devices or nodes in a distributed setting."""
         del num_processes
         if dist.is_initialized() and torch.cuda.is_available() and self.exist():
-            for covariance_factor_name in COVARIANCE_FACTOR_NAMES:
-                self.module.storage[covariance_factor_name] = self.module.storage[covariance_factor_name].cuda()
-                dist.reduce(
-                    tensor=self.module.storage[covariance_factor_name],
-                    op=dist.ReduceOp.SUM,
-                    dst=0,
-                )
+            self._reduce_factors(factor_names=COVARIANCE_FACTOR_NAMES)
 
     def release_memory(self) -> None:
         """Clears all covariance matrices from memory."""
@@ -152,6 +204,12 @@ class CovarianceTracker(BaseTracker):
 class LambdaTracker(BaseTracker):
     """Tracks and computes Lambda matrices for a given module."""
 
+    def __init__(self, module: nn.Module) -> None:
+        super().__init__(module=module)
+        # Activations for modules with shared parameters are pushed and popped in LIFO order. The same container
+        # is reused across iterations instead of creating a new list every iteration.
+        self._shared_activations: Deque[torch.Tensor] = deque()
+
     def _eigendecomposition_results_exist(self) -> bool:
         """Checks if eigendecomposition results are available."""
         for eigen_factor_name in EIGENDECOMPOSITION_FACTOR_NAMES:
@@ -159,6 +217,23 @@ class LambdaTracker(BaseTracker):
                 return False
         return True
 
+    def _rotate_per_sample_gradient(self, per_sample_gradient: torch.Tensor) -> torch.Tensor:
+        """Projects the per-sample gradient onto the eigenbasis of the pseudo-gradient and activation covariance
+        matrices.
+
+        Args:
+            per_sample_gradient (torch.Tensor):
+                The per-sample gradient tensor for the given batch.
+
+        Returns:
+            torch.Tensor:
+                The per-sample gradient expressed in the Kronecker-factored eigenbasis.
+        """
+        return torch.matmul(
+            self.module.storage[GRADIENT_EIGENVECTORS_NAME].t(),
+            torch.matmul(per_sample_gradient, self.module.storage[ACTIVATION_EIGENVECTORS_NAME]),
+        )
+
     def _update_lambda_matrix(self, per_sample_gradient: torch.Tensor) -> None:
         """Computes and updates the Lambda matrix using provided per-sample gradient.
 
@@ -174,9 +249,11 @@ class LambdaTracker(BaseTracker):
                 dtype=torch.int64,
                 requires_grad=False,
             )
+            # Lambda matrices are accumulated in at least single precision to avoid drift over many examples.
+            # They are cast back to `lambda_dtype` in `finalize_all_iterations`.
             self.module.storage[LAMBDA_MATRIX_NAME] = torch.zeros(
                 size=(per_sample_gradient.size(1), per_sample_gradient.size(2)),
-                dtype=per_sample_gradient.dtype,
+                dtype=torch.promote_types(per_sample_gradient.dtype, torch.float32),
                 device=per_sample_gradient.device,
                 requires_grad=False,
             )
@@ -201,32 +278,28 @@ class LambdaTracker(BaseTracker):
                 )
 
         self.module.storage[NUM_LAMBDA_PROCESSED].add_(batch_size)
+        accumulation_dtype = self.module.storage[LAMBDA_MATRIX_NAME].dtype
         if FactorConfig.CONFIGS[self.module.factor_args.strategy].requires_eigendecomposition_for_lambda:
             if self.module.factor_args.use_iterative_lambda_aggregation:
                 # This batch-wise iterative update can be useful when the GPU memory is limited.
-                per_sample_gradient = torch.matmul(
-                    per_sample_gradient,
-                    self.module.storage[ACTIVATION_EIGENVECTORS_NAME],
-                )
-                for i in range(batch_size):
-                    sqrt_lambda = torch.matmul(
-                        self.module.storage[GRADIENT_EIGENVECTORS_NAME].t(),
-                        per_sample_gradient[i],
+                # Examples are processed in chunks to amortize the kernel launch cost over multiple examples.
+                for start_idx in range(0, batch_size, LAMBDA_AGGREGATION_CHUNK_SIZE):
+                    sqrt_lambda = self._rotate_per_sample_gradient(
+                        per_sample_gradient=per_sample_gradient[start_idx : start_idx + LAMBDA_AGGREGATION_CHUNK_SIZE],
+                    )
+                    self.module.storage[LAMBDA_MATRIX_NAME].add_(
+                        sqrt_lambda.square_().sum(dim=0, dtype=accumulation_dtype)
                     )
-                    self.module.storage[LAMBDA_MATRIX_NAME].add_(sqrt_lambda.square_())
             else:
                 per_sample_gradient = (
-                    torch.matmul(
-                        self.module.storage[GRADIENT_EIGENVECTORS_NAME].t(),
-                        torch.matmul(per_sample_gradient, self.module.storage[ACTIVATION_EIGENVECTORS_NAME]),
-                    )
+                    self._rotate_per_sample_gradient(per_sample_gradient=per_sample_gradient)
                     .square_()
-                    .sum(dim=0)
+                    .sum(dim=0, dtype=accumulation_dtype)
                 )
                 self.module.storage[LAMBDA_MATRIX_NAME].add_(per_sample_gradient)
         else:
             # Approximate the eigenbasis as identity.
-            per_sample_gradient = per_sample_gradient.square_().sum(dim=0)
+            per_sample_gradient = per_sample_gradient.square_().sum(dim=0, dtype=accumulation_dtype)
             self.module.storage[LAMBDA_MATRIX_NAME].add_(per_sample_gradient)
 
     def register_hooks(self) -> None:
@@ -236,15 +309,19 @@ class LambdaTracker(BaseTracker):
         def forward_hook(module: nn.Module, inputs: Tuple[torch.Tensor], outputs: torch.Tensor) -> None:
             del module
             cached_activation = inputs[0].detach()
-            device = "cpu" if self.module.factor_args.offload_activations_to_cpu else cached_activation.device
-            cached_activation = cached_activation.to(
-                device=device,
-                dtype=self.module.factor_args.per_sample_gradient_dtype,
-                copy=True,
-            )
+            if self.module.factor_args.offload_activations_to_cpu:
+                cached_activation = self._offload_activation_to_cpu(
+                    activation=cached_activation,
+                    dtype=self.module.factor_args.per_sample_gradient_dtype,
+                )
+            else:
+                cached_activation = cached_activation.to(
+                    dtype=self.module.factor_args.per_sample_gradient_dtype,
+                    copy=True,
+                )
             if self.module.factor_args.has_shared_parameters:
                 if self.cached_activations is None:
-                    self.cached_activations = []
+                    self.cached_activations = self._shared_activations
                 self.cached_activations.append(cached_activation)
             else:
                 self.cached_activations = cached_activation
@@ -262,7 +339,7 @@ class LambdaTracker(BaseTracker):
             handle.remove()
             output_gradient = output_gradient.detach().to(dtype=self.module.factor_args.per_sample_gradient_dtype)
             per_sample_gradient = self.module.compute_per_sample_gradient(
-                input_activation=self.cached_activations.to(device=output_gradient.device),
+                input_activation=self.cached_activations.to(device=output_gradient.device, non_blocking=True),
                 output_gradient=output_gradient,
             ).to(dtype=self.module.factor_args.lambda_dtype)
             self.clear_all_cache()
@@ -279,16 +356,23 @@ class LambdaTracker(BaseTracker):
             output_gradient = output_gradient.detach().to(dtype=self.module.factor_args.per_sample_gradient_dtype)
             cached_activation = self.cached_activations.pop()
             per_sample_gradient = self.module.compute_per_sample_gradient(
-                input_activation=cached_activation.to(device=output_gradient.device),
+                input_activation=cached_activation.to(device=output_gradient.device, non_blocking=True),
                 output_gradient=output_gradient,
             )
+            # Aggregates per-sample gradients during backward pass. The first per-sample gradient of the iteration
+            # is used as the buffer directly to avoid allocating and zero-filling a new tensor.
             if self.cached_per_sample_gradient is None:
-                self.cached_per_sample_gradient = torch.zeros_like(per_sample_gradient, requires_grad=False)
-            # Aggregates per-sample gradients during backward pass.
-            self.cached_per_sample_gradient.add_(per_sample_gradient)
+                self.cached_per_sample_gradient = per_sample_gradient
+            else:
+                self.cached_per_sample_gradient.add_(per_sample_gradient)
 
         self.registered_hooks.append(self.module.register_forward_hook(forward_hook))
 
+    def clear_all_cache(self) -> None:
+        """Clears all cached data and removes cached hooks."""
+        self._shared_activations.clear()
+        super().clear_all_cache()
+
     @torch.no_grad()
     def finalize_iteration(self) -> None:
         """Updates Lambda matrix using cached per-sample gradients."""
@@ -301,6 +385,13 @@ class LambdaTracker(BaseTracker):
             self._update_lambda_matrix(per_sample_gradient=self.cached_per_sample_gradient)
         self.clear_all_cache()
 
+    def finalize_all_iterations(self) -> None:
+        """Casts the accumulated Lambda matrix to the configured `lambda_dtype`."""
+        if self.module.storage[LAMBDA_MATRIX_NAME] is not None:
+            self.module.storage[LAMBDA_MATRIX_NAME] = self.module.storage[LAMBDA_MATRIX_NAME].to(
+                dtype=self.module.factor_args.lambda_dtype
+            )
+
     def exist(self) -> bool:
         """Checks if Lambda matrices are available."""
         for lambda_factor_name in LAMBDA_FACTOR_NAMES:
@@ -312,13 +403,7 @@ class LambdaTracker(BaseTracker):
         """Aggregates Lambda matrices across multiple devices or nodes in a distributed setting."""
         del num_processes
         if dist.is_initialized() and torch.cuda.is_available() and self.exist():
-            for lambda_factor_name in LAMBDA_FACTOR_NAMES:
-                self.module.storage[lambda_factor_name] = self.module.storage[lambda_factor_name].cuda()
-                dist.reduce(
-                    tensor=self.module.storage[lambda_factor_name],
-                    op=dist.ReduceOp.SUM,
-                    dst=0,
-                )
+            self._reduce_factors(factor_names=LAMBDA_FACTOR_NAMES)
 
     def release_memory(self) -> None:
         """Clears Lambda matrices from memory."""
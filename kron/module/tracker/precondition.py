@@ -132,10 +132,12 @@ class PreconditionTracker(BaseTracker):
                 input_activation=cached_activation.to(device=output_gradient.device),
                 output_gradient=output_gradient,
             )
+            # Aggregates per-sample gradients during backward pass. The first per-sample gradient of the iteration
+            # is used as the buffer directly to avoid allocating and zero-filling a new tensor.
             if self.cached_per_sample_gradient is None:
-                self.cached_per_sample_gradient = torch.zeros_like(per_sample_gradient, requires_grad=False)
-            # Aggregates per-sample gradients during backward pass.
-            self.cached_per_sample_gradient.add_(per_sample_gradient)
+                self.cached_per_sample_gradient = per_sample_gradient
+            else:
+                self.cached_per_sample_gradient.add_(per_sample_gradient)
 
         self.registered_hooks.append(self.module.register_forward_hook(forward_hook))
 
@@ -330,9 +330,16 @@ def synchronize_modules(model: nn.Module, tracked_module_names: List[str], num_p
         num_processes (int):
             The number of processes to synchronize across.
     """
-    for module in model.modules():
-        if isinstance(module, TrackedModule) and module.name in tracked_module_names:
-            module.synchronize(num_processes=num_processes)
+    tracked_modules = [
+        module
+        for module in model.modules()
+        if isinstance(module, TrackedModule) and module.name in tracked_module_names
+    ]
+    # Reductions for all modules are issued before waiting on any of them, so that they can overlap.
+    for module in tracked_modules:
+        module.synchronize(num_processes=num_processes)
+    for module in tracked_modules:
+        module.wait_for_synchronization()
 
 
 def truncate(model: nn.Module, tracked_module_names: List[str], keep_size: int) -> None:
@@ -29,6 +29,16 @@ GRADIENT_COVARIANCE_MATRIX_NAME = "gradient_covariance"
 NUM_ACTIVATION_COVARIANCE_PROCESSED = "num_activation_covariance_processed"
 NUM_GRADIENT_COVARIANCE_PROCESSED = "num_gradient_covariance_processed"
 
+# The minimum feature dimension at which covariance matrices are accumulated with separate `mm` and `add_` calls
+# instead of the fused `addmm_`.
+COVARIANCE_UNFUSED_ACCUMULATION_THRESHOLD = 4096
+
+# The number of rows in each block of the covariance matrix updated at once when accumulating large covariance matrices.
+COVARIANCE_ACCUMULATION_BLOCK_SIZE = 1024
+
+# The maximum number of elements in the flattened activation materialized at once for modules that expand the input
+# when flattening (e.g., `nn.Conv2d`). Larger batches are flattened and accumulated in chunks of examples.
+FLATTENED_ACTIVATION_CHUNK_NUMEL = 2**27
 
 # A list of factors to keep track of when computing covariance matrices.
 COVARIANCE_FACTOR_NAMES = [
@@ -61,6 +71,9 @@ LAMBDA_MATRIX_NAME = "lambda_matrix"
 # Number of data points used to computed Lambda matrix.
 NUM_LAMBDA_PROCESSED = "num_lambda_processed"
 
+# The number of examples to process at once when iteratively aggregating Lambda matrices.
+LAMBDA_AGGREGATION_CHUNK_SIZE = 32
+
 # A list of factors to keep track of when computing Lambda matrices.
 LAMBDA_FACTOR_NAMES = [LAMBDA_MATRIX_NAME, NUM_LAMBDA_PROCESSED]
 
@@ -509,3 +509,183 @@ def test_covariance_matrices_inplace(
         atol=ATOL,
         rtol=RTOL,
     )
+
+
+@pytest.mark.parametrize("test_name", ["mlp", "conv"])
+@pytest.mark.parametrize(
+    "input_dtype, tolerance",
+    [(torch.float32, 1e-3), (torch.bfloat16, 5e-2)],
+)
+@pytest.mark.parametrize("train_size", [100])
+@pytest.mark.parametrize("seed", [9])
+def test_covariance_matrices_input_dtype(
+    test_name: str,
+    input_dtype: torch.dtype,
+    tolerance: float,
+    train_size: int,
+    seed: int,
+) -> None:
+    # Covariance matrices should be accumulated in the covariance dtype even when lower precision inputs are used.
+    model, train_dataset, _, data_collator, task = prepare_test(
+        test_name=test_name,
+        train_size=train_size,
+        seed=seed,
+    )
+    kwargs = DataLoaderKwargs(collate_fn=data_collator)
+    model = model.to(dtype=torch.float64)
+    model, analyzer = prepare_model_and_analyzer(
+        model=model,
+        task=task,
+    )
+
+    factor_args = pytest_factor_arguments()
+    analyzer.fit_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+    )
+
+    factor_args.activation_covariance_input_dtype = input_dtype
+    factor_args.gradient_covariance_input_dtype = input_dtype
+    analyzer.fit_covariance_matrices(
+        factors_name=custom_factors_name("input_dtype"),
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    input_dtype_covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=custom_factors_name("input_dtype"),
+    )
+
+    for name in [ACTIVATION_COVARIANCE_MATRIX_NAME, GRADIENT_COVARIANCE_MATRIX_NAME]:
+        for module_name in input_dtype_covariance_factors[name]:
+            assert input_dtype_covariance_factors[name][module_name].dtype == torch.float64
+        assert check_tensor_dict_equivalence(
+            covariance_factors[name],
+            input_dtype_covariance_factors[name],
+            atol=tolerance,
+            rtol=tolerance,
+        )
+
+
+@pytest.mark.parametrize("test_name", ["conv"])
+@pytest.mark.parametrize("train_size", [100])
+@pytest.mark.parametrize("seed", [10])
+def test_covariance_matrices_flattened_activation_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+    test_name: str,
+    train_size: int,
+    seed: int,
+) -> None:
+    # Flattening the activations in chunks of examples should produce the same covariance matrices.
+    model, train_dataset, _, data_collator, task = prepare_test(
+        test_name=test_name,
+        train_size=train_size,
+        seed=seed,
+    )
+    kwargs = DataLoaderKwargs(collate_fn=data_collator)
+    model = model.to(dtype=torch.float64)
+    model, analyzer = prepare_model_and_analyzer(
+        model=model,
+        task=task,
+    )
+
+    factor_args = pytest_factor_arguments()
+    analyzer.fit_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+    )
+
+    monkeypatch.setattr("kron.module.conv2d.FLATTENED_ACTIVATION_CHUNK_NUMEL", 1)
+    analyzer.fit_covariance_matrices(
+        factors_name=custom_factors_name("chunks"),
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    chunked_covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=custom_factors_name("chunks"),
+    )
+
+    for name in COVARIANCE_FACTOR_NAMES:
+        assert check_tensor_dict_equivalence(
+            covariance_factors[name],
+            chunked_covariance_factors[name],
+            atol=ATOL,
+            rtol=RTOL,
+        )
+
+
+@pytest.mark.parametrize("test_name", ["mlp", "conv"])
+@pytest.mark.parametrize("train_size", [100])
+@pytest.mark.parametrize("seed", [11])
+def test_covariance_matrices_symmetric_accumulation(
+    monkeypatch: pytest.MonkeyPatch,
+    test_name: str,
+    train_size: int,
+    seed: int,
+) -> None:
+    # Accumulating the covariance matrices block by block using symmetry should produce the same results.
+    model, train_dataset, _, data_collator, task = prepare_test(
+        test_name=test_name,
+        train_size=train_size,
+        seed=seed,
+    )
+    kwargs = DataLoaderKwargs(collate_fn=data_collator)
+    model = model.to(dtype=torch.float64)
+    model, analyzer = prepare_model_and_analyzer(
+        model=model,
+        task=task,
+    )
+
+    factor_args = pytest_factor_arguments()
+    analyzer.fit_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+    )
+
+    monkeypatch.setattr("kron.module.tracker.factor.COVARIANCE_UNFUSED_ACCUMULATION_THRESHOLD", 1)
+    monkeypatch.setattr("kron.module.tracker.factor.COVARIANCE_ACCUMULATION_BLOCK_SIZE", 3)
+    analyzer.fit_covariance_matrices(
+        factors_name=custom_factors_name("symmetric"),
+        dataset=train_dataset,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+        factor_args=factor_args,
+    )
+    symmetric_covariance_factors = analyzer.load_covariance_matrices(
+        factors_name=custom_factors_name("symmetric"),
+    )
+
+    for name in COVARIANCE_FACTOR_NAMES:
+        assert check_tensor_dict_equivalence(
+            covariance_factors[name],
+            symmetric_covariance_factors[name],
+            atol=ATOL,
+            rtol=RTOL,
+        )
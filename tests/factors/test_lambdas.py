@@ -272,6 +272,60 @@ def test_lambda_matrices_iterative_lambda_aggregation(
         assert check_tensor_dict_equivalence(lambda_factors[name], iterative_lambda_factors[name], atol=ATOL, rtol=RTOL)
 
 
+@pytest.mark.parametrize("test_name", ["mlp", "conv"])
+@pytest.mark.parametrize("train_size", [63])
+@pytest.mark.parametrize("seed", [3])
+def test_lambda_matrices_iterative_lambda_aggregation_chunks(
+    monkeypatch: pytest.MonkeyPatch,
+    test_name: str,
+    train_size: int,
+    seed: int,
+) -> None:
+    # Iterative lambda computation should be consistent when each batch spans multiple (uneven) chunks.
+    model, train_dataset, _, data_collator, task = prepare_test(
+        test_name=test_name,
+        train_size=train_size,
+        seed=seed,
+    )
+    kwargs = DataLoaderKwargs(collate_fn=data_collator)
+    model = model.to(dtype=torch.float64)
+    model, analyzer = prepare_model_and_analyzer(
+        model=model,
+        task=task,
+    )
+
+    factor_args = pytest_factor_arguments()
+    factor_args.use_iterative_lambda_aggregation = False
+    analyzer.fit_all_factors(
+        factors_name=DEFAULT_FACTORS_NAME,
+        dataset=train_dataset,
+        factor_args=factor_args,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+    )
+    lambda_factors = analyzer.load_lambda_matrices(
+        factors_name=DEFAULT_FACTORS_NAME,
+    )
+
+    monkeypatch.setattr("kron.module.tracker.factor.LAMBDA_AGGREGATION_CHUNK_SIZE", 3)
+    factor_args.use_iterative_lambda_aggregation = True
+    analyzer.fit_all_factors(
+        factors_name=custom_factors_name("iterative_chunks"),
+        dataset=train_dataset,
+        factor_args=factor_args,
+        per_device_batch_size=16,
+        overwrite_output_dir=True,
+        dataloader_kwargs=kwargs,
+    )
+    iterative_lambda_factors = analyzer.load_lambda_matrices(
+        factors_name=custom_factors_name("iterative_chunks"),
+    )
+
+    for name in LAMBDA_FACTOR_NAMES:
+        assert check_tensor_dict_equivalence(lambda_factors[name], iterative_lambda_factors[name], atol=ATOL, rtol=RTOL)
+
+
 @pytest.mark.parametrize(
     "test_name",
     ["conv_bn", "gpt"],
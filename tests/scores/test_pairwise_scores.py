@@ -976,3 +976,71 @@ def test_pairwise_query_batching(
 
     for i in range(query_size):
         assert spearmanr(scores[ALL_MODULE_NAME][i], qb_scores[ALL_MODULE_NAME][i])[0] > 0.9
+
+
+@pytest.mark.parametrize("test_name", ["mlp", "conv"])
+@pytest.mark.parametrize("query_size", [30])
+@pytest.mark.parametrize("train_size", [64])
+@pytest.mark.parametrize("seed", [12])
+def test_pairwise_scores_single_query_batch(
+    test_name: str,
+    query_size: int,
+    train_size: int,
+    seed: int,
+) -> None:
+    # Pairwise scores should be identical when all query data points are processed in a single batch.
+    model, train_dataset, test_dataset, data_collator, task = prepare_test(
+        test_name=test_name,
+        query_size=query_size,
+        train_size=train_size,
+        seed=seed,
+    )
+    model = model.to(dtype=torch.float64)
+    kwargs = DataLoaderKwargs(collate_fn=data_collator)
+    model, analyzer = prepare_model_and_analyzer(
+        model=model,
+        task=task,
+    )
+    factor_args = pytest_factor_arguments()
+    analyzer.fit_all_factors(
+        factors_name=DEFAULT_FACTORS_NAME,
+        factor_args=factor_args,
+        dataset=train_dataset,
+        dataloader_kwargs=kwargs,
+        per_device_batch_size=8,
+        overwrite_output_dir=True,
+    )
+    score_args = pytest_score_arguments()
+    analyzer.compute_pairwise_scores(
+        scores_name=DEFAULT_SCORES_NAME,
+        score_args=score_args,
+        factors_name=DEFAULT_FACTORS_NAME,
+        query_dataset=test_dataset,
+        per_device_query_batch_size=4,
+        train_dataset=train_dataset,
+        per_device_train_batch_size=8,
+        dataloader_kwargs=kwargs,
+        overwrite_output_dir=True,
+    )
+    scores = analyzer.load_pairwise_scores(scores_name=DEFAULT_SCORES_NAME)
+
+    analyzer.compute_pairwise_scores(
+        scores_name=custom_scores_name("single_batch"),
+        score_args=score_args,
+        factors_name=DEFAULT_FACTORS_NAME,
+        query_dataset=test_dataset,
+        per_device_query_batch_size=None,
+        train_dataset=train_dataset,
+        per_device_train_batch_size=8,
+        dataloader_kwargs=kwargs,
+        overwrite_output_dir=True,
+    )
+    single_batch_scores = analyzer.load_pairwise_scores(scores_name=custom_scores_name("single_batch"))
+
+    assert single_batch_scores[ALL_MODULE_NAME].size(0) == query_size
+    assert check_tensor_dict_equivalence(
+        scores,
+        single_batch_scores,
+        atol=ATOL,
+        rtol=RTOL,
+    )
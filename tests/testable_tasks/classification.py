@@ -78,11 +78,10 @@ class ClassificationTask(Task):
         if not sample:
             return F.cross_entropy(logits, labels, reduction="sum")
         with torch.no_grad():
-            probs = torch.nn.functional.softmax(logits.detach(), dim=-1)
-            sampled_labels = torch.multinomial(
-                probs,
-                num_samples=1,
-            ).flatten()
+            # Gumbel-max sampling from softmax(logits), computed in at least single precision.
+            dtype = torch.promote_types(logits.dtype, torch.float32)
+            uniform_noise = torch.rand_like(logits, dtype=dtype).clamp_min_(torch.finfo(dtype).tiny)
+            sampled_labels = (logits.detach().to(dtype) - torch.log(-torch.log(uniform_noise))).argmax(dim=-1)
         return F.cross_entropy(logits, sampled_labels, reduction="sum")
 
     def compute_measurement(
@@ -96,13 +95,11 @@ class ClassificationTask(Task):
             inputs = inputs.to(dtype=torch.float64)
         logits = model(inputs)
 
-        bindex = torch.arange(logits.shape[0]).to(device=logits.device, non_blocking=False)
-        logits_correct = logits[bindex, labels]
+        logits_correct = logits.gather(dim=-1, index=labels.unsqueeze(-1)).squeeze(-1)
+        # Masking allocates a copy of the logits, but keeps the log-sum-exp over the incorrect classes exact.
+        masked_logits = logits.scatter(dim=-1, index=labels.unsqueeze(-1), value=float("-inf"))
 
-        cloned_logits = logits.clone()
-        cloned_logits[bindex, labels] = torch.tensor(-torch.inf, device=logits.device, dtype=logits.dtype)
-
-        margins = logits_correct - cloned_logits.logsumexp(dim=-1)
+        margins = logits_correct - masked_logits.logsumexp(dim=-1)
         return -margins.sum()
 
 
@@ -122,11 +122,12 @@ class LanguageModelingTask(Task):
         else:
             reshaped_shift_logits = shift_logits.view(-1, shift_logits.size(-1))
             with torch.no_grad():
-                probs = torch.nn.functional.softmax(reshaped_shift_logits.detach(), dim=-1)
-                sampled_labels = torch.multinomial(
-                    probs,
-                    num_samples=1,
-                ).flatten()
+                # Gumbel-max sampling from softmax(logits), computed in at least single precision.
+                dtype = torch.promote_types(reshaped_shift_logits.dtype, torch.float32)
+                uniform_noise = torch.rand_like(reshaped_shift_logits, dtype=dtype)
+                uniform_noise.clamp_min_(torch.finfo(dtype).tiny)
+                gumbel_noise = -torch.log(-torch.log(uniform_noise))
+                sampled_labels = (reshaped_shift_logits.detach().to(dtype) + gumbel_noise).argmax(dim=-1)
             summed_loss = F.cross_entropy(reshaped_shift_logits, sampled_labels, reduction="sum")
         return summed_loss
 
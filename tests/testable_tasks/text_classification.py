@@ -91,11 +91,10 @@ class TextClassificationTask(Task):
         if not sample:
             return F.cross_entropy(logits, batch["labels"], reduction="sum")
         with torch.no_grad():
-            probs = torch.nn.functional.softmax(logits.detach(), dim=-1)
-            sampled_labels = torch.multinomial(
-                probs,
-                num_samples=1,
-            ).flatten()
+            # Gumbel-max sampling from softmax(logits), computed in at least single precision.
+            dtype = torch.promote_types(logits.dtype, torch.float32)
+            uniform_noise = torch.rand_like(logits, dtype=dtype).clamp_min_(torch.finfo(dtype).tiny)
+            sampled_labels = (logits.detach().to(dtype) - torch.log(-torch.log(uniform_noise))).argmax(dim=-1)
         return F.cross_entropy(logits, sampled_labels, reduction="sum")
 
     def compute_measurement(
@@ -110,11 +109,11 @@ class TextClassificationTask(Task):
         ).logits
 
         labels = batch["labels"]
-        bindex = torch.arange(logits.shape[0]).to(device=logits.device, non_blocking=False)
+        bindex = torch.arange(logits.shape[0], device=logits.device)
         logits_correct = logits[bindex, labels]
 
         cloned_logits = logits.clone()
-        cloned_logits[bindex, labels] = torch.tensor(-torch.inf, device=logits.device, dtype=logits.dtype)
+        cloned_logits[bindex, labels] = float("-inf")
 
         margins = logits_correct - cloned_logits.logsumexp(dim=-1)
         return -margins.sum()
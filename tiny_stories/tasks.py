@@ -30,11 +30,12 @@ class TinyStoriesTask(Task):
             )
         else:
             with torch.no_grad():
-                probs = torch.nn.functional.softmax(logits.detach(), dim=-1)
-                sampled_labels = torch.multinomial(
-                    probs,
-                    num_samples=1,
-                ).flatten()
+                # Gumbel-max sampling, computed in at least single precision.
+                dtype = torch.promote_types(logits.dtype, torch.float32)
+                uniform_noise = torch.rand_like(logits, dtype=dtype)
+                uniform_noise.clamp_min_(torch.finfo(dtype).tiny)
+                gumbel_noise = -torch.log(-torch.log(uniform_noise))
+                sampled_labels = (logits.detach().to(dtype) + gumbel_noise).argmax(dim=-1)
                 masks = labels.view(-1) == -100
                 sampled_labels[masks] = -100
             summed_loss = F.cross_entropy(
@@ -44,6 +44,12 @@ def parse_args():
         default=False,
         help="Whether to use half precision for computing factors and scores.",
     )
+    parser.add_argument(
+        "--use_compile",
+        type=bool,
+        default=False,
+        help="Whether to use `torch.compile` for computing factors and scores.",
+    )
     parser.add_argument(
         "--query_batch_size",
         type=int,
@@ -133,12 +139,14 @@ def main(cfg : DictConfig):
         checkpoint_path = checkpoint_path_template.format(step)
         config['model']['checkpoint_path'] = checkpoint_path
 
-        # Load the model for this checkpoint
+        # Load the model for this checkpoint (the state dict is loaded from `checkpoint_path` by the model loader)
         model = get_grokking_model(config, dataset, device)
-        model.load_state_dict(torch.load(checkpoint_path))
 
         # Prepare model
         model = prepare_model(model, task)
+        if args.use_compile:
+            # Influence tracking hooks are registered on the wrapped modules, so they run at graph breaks.
+            model = torch.compile(model, fullgraph=False, dynamic=False)
 
         analyzer = Analyzer(
             analysis_name=f"wikitext_step{step}",
@@ -42,7 +42,8 @@ def load_grokk_model(config, vocab_size, out_size, device, verbose=True):
     if config['checkpoint_path'] is not None:
         if verbose:
             print(f'loading grokk_model state dict from: {convert_path(config["checkpoint_path"])}')
-        model.load_state_dict(torch.load(convert_path(config['checkpoint_path']), map_location='cpu'), strict=config['strict_load'])
+        state_dict = torch.load(convert_path(config['checkpoint_path']), map_location=device, mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, strict=config['strict_load'])
         if verbose:
             print('loaded.')
     return model
\ No newline at end of file